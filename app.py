@@ -1,153 +1,182 @@
 # Standard library imports
+import asyncio
+import concurrent.futures
+import contextlib
 import datetime
+import functools
 import json
 import os
 import re
 import time
 import typing
-import threading
 import random
+import urllib.parse
 
 # Third-party imports
+import aiohttp
+import aiohttp_socks
 import cachetools
-import flask
-import playwright.sync_api
-import python_socks.sync
-import requests
-import requests.adapters
-import requests.utils
-
-from shipment_variables import country_cache, courier_cache, status_cache
-
-try:
-    import requests.packages.urllib3 as urllib3
-except ImportError:
-    import urllib3
-
-HTTPConnection = urllib3.connection.HTTPConnection
-HTTPSConnection = urllib3.connection.HTTPSConnection
-HTTPConnectionPool = urllib3.connectionpool.HTTPConnectionPool
-HTTPSConnectionPool = urllib3.connectionpool.HTTPSConnectionPool
-PoolManager = urllib3.PoolManager
-real_get_connection = requests.adapters.HTTPAdapter.get_connection
-current_proxy_index = 0
+import fastapi
+import fastapi.middleware.gzip
+import fastapi.responses
+import orjson
+import pydantic
+import python_socks
+import uvicorn
+
+from shipment_variables import (
+    country_by_number_key,
+    courier_by_key,
+    courier_code_by_slug,
+    status_by_key,
+)
 
-def patch_proxy_connection():
-    """Patch proxy connection to chain"""
-    requests.adapters.HTTPAdapter.get_connection = patched_get_connection
+TRACK_API_URL = "https://t.17track.net/restapi/track"
+current_proxy_index = 0
 
-def proxy_from_url(url: str):
+def proxy_from_url(url: str) -> aiohttp_socks.ProxyInfo:
     """Parse proxy URL"""
+    rdns = None
     for scheme in "socks4", "socks5":
         scheme_rdns = scheme + "h"
         if url.startswith(scheme_rdns):
             url = url.replace(scheme_rdns, scheme, 1)
-            return python_socks.sync.Proxy.from_url(url, rdns=True)
-    return python_socks.sync.Proxy.from_url(url)
-
-def parse_proxychain_url(url):
+            rdns = True
+            break
+    proxy_type, host, port, username, password = python_socks.parse_proxy_url(url)
+    return aiohttp_socks.ProxyInfo(
+        proxy_type=proxy_type,
+        host=host,
+        port=port,
+        username=username,
+        password=password,
+        rdns=rdns,
+    )
+
+def parse_proxychain_url(url: str) -> typing.Tuple[aiohttp_socks.ProxyInfo, ...]:
     """Parse proxychain URL"""
     proxy = map(str.strip, url.split(","))
     proxy = filter(None, proxy)
-    proxy = list(map(proxy_from_url, proxy))
-    return python_socks.sync.ProxyChain(proxy)
-
-class ChainConnection(HTTPConnection):
-    def __init__(self, *args, **kwargs):
-        self._socks_options = kwargs.pop("_socks_options")
-        super().__init__(*args, **kwargs)
-
-    def _new_conn(self):
-        proxy = self._socks_options["proxychain"]
-        conn = proxy.connect(self.host, self.port)
-        conn.setblocking(True)
-        return conn
-
-class ChainHTTPSConnection(ChainConnection, HTTPSConnection):
-    pass
-
-class ChainHTTPConnectionPool(HTTPConnectionPool):
-    ConnectionCls = ChainConnection
-
-class ChainHTTPSConnectionPool(HTTPSConnectionPool):
-    ConnectionCls = ChainHTTPSConnection
-
-class ProxyChainManager(PoolManager):
-    pool_classes_by_scheme = {
-        "http": ChainHTTPConnectionPool,
-        "https": ChainHTTPSConnectionPool,
-    }
-    def __init__(self, proxy_url, num_pools, **connection_pool_kw):
-        proxy = parse_proxychain_url(proxy_url)
-        connection_pool_kw["_socks_options"] = dict(proxychain=proxy)
-        super().__init__(num_pools, None, **connection_pool_kw)
-        self.pool_classes_by_scheme = __class__.pool_classes_by_scheme
-
-def patched_get_connection(self, url, proxies):
-    """Get a connection based on the proxy scheme"""
-    proxy = requests.utils.select_proxy(url, proxies)
-    is_proxychain = proxy and "," in proxy
-    if not is_proxychain:
-        return real_get_connection(self, url, proxies)
-
-    manager = self.proxy_manager.get(proxy)
-    if manager is None:
-        manager = ProxyChainManager(
-            proxy,
-            num_pools=self._pool_connections,
-            maxsize=self._pool_maxsize,
-            block=self._pool_block,
+    return tuple(map(proxy_from_url, proxy))
+
+def select_proxy(proxies: typing.Optional[dict]) -> typing.Optional[str]:
+    """Pick the proxy (chain) URL to use for HTTPS requests"""
+    if not proxies:
+        return None
+    return proxies.get("https") or proxies.get("all") or None
+
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 50
+# Proxies are rotated per request, so an idle chain has to outlive a full
+# rotation to be reused; aiohttp's default of 15 seconds rarely does
+PROXY_KEEPALIVE_SECONDS = 120
+
+# One long-lived session per proxy URL (None for direct connections), so
+# keep-alive connections and TLS sessions are reused across requests
+http_sessions: typing.Dict[typing.Optional[str], aiohttp.ClientSession] = {}
+
+def get_http_session(proxy: typing.Optional[str]) -> aiohttp.ClientSession:
+    """Get the shared session for a proxy (chain) URL, creating it on first use"""
+    session = http_sessions.get(proxy)
+    if session is None or session.closed:
+        pool_options = dict(limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST)
+        if proxy:
+            connector = aiohttp_socks.ChainProxyConnector(
+                parse_proxychain_url(proxy),
+                keepalive_timeout=PROXY_KEEPALIVE_SECONDS,
+                **pool_options,
+            )
+        else:
+            connector = aiohttp.TCPConnector(**pool_options)
+        session = aiohttp.ClientSession(
+            connector=connector,
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
         )
-        self.proxy_manager[proxy] = manager
-
-    return manager.connection_from_url(url)
+        http_sessions[proxy] = session
+    return session
+
+# Sessions of proxies that left the proxy list; closed one reload later so
+# requests that already picked them can finish
+retired_http_sessions: typing.List[aiohttp.ClientSession] = []
+
+async def retire_stale_http_sessions(active_proxies: typing.Iterable[str]) -> None:
+    """Close the sessions retired on the previous call and retire those of proxies no longer in `active_proxies`"""
+    sessions = list(retired_http_sessions)
+    retired_http_sessions.clear()
+    active_proxies = set(active_proxies)
+    for proxy in [proxy for proxy in http_sessions if proxy and proxy not in active_proxies]:
+        retired_http_sessions.append(http_sessions.pop(proxy))
+    for session in sessions:
+        await session.close()
+
+async def close_http_sessions() -> None:
+    """Close all shared sessions and their pooled connections"""
+    sessions = [*http_sessions.values(), *retired_http_sessions]
+    http_sessions.clear()
+    retired_http_sessions.clear()
+    for session in sessions:
+        await session.close()
 
 CACHE_JSON = "cache.json"
-CACHE_CACHE = cachetools.TTLCache(maxsize=1, ttl=10)
+CACHE_TTL_SECONDS = 10
+
+def dump_json_bytes(data: typing.Any) -> bytes:
+    """Serialize data to indented JSON for cache.json"""
+    # Not orjson: cache.json holds the 22-digit last_tracking_number, which is
+    # wider than the 64-bit integers orjson can serialize
+    return json.dumps(data, indent=4).encode()
 
 class JsonFileHandler:
-    def __init__(self, file_path: str, cache: cachetools.TTLCache, default_data: typing.Dict):
+    def __init__(self, file_path: str, ttl_seconds: float, default_data: typing.Dict):
         self.file_path = file_path
-        self.cache = cache
+        self.ttl_seconds = ttl_seconds
         self.default_data = default_data
+        # (data, expiry) snapshot; replaced as a whole so readers never need a lock
+        self._snapshot = (None, 0.0)
 
     def read(self) -> typing.Dict:
-        if self.file_path in self.cache:
-            return self.cache[self.file_path]
+        data, expiry = self._snapshot
+        if data is not None and time.monotonic() < expiry:
+            return data
         
         try:
-            if os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0:
-                with open(self.file_path, 'r') as file:
-                    data = json.load(file)
-                    self.cache[self.file_path] = data
-                    return data
-            else:
-                self.initialize()
-                return self.read()
+            with open(self.file_path, 'rb') as file:
+                blob = file.read()
         except FileNotFoundError:
             print(f"[!] {self.file_path} not found, initializing with default data.")
+            blob = b""
+        if not blob:
             self.initialize()
             return self.read()
 
+        # Not orjson: it silently turns integers wider than 64 bits into floats
+        data = json.loads(blob)
+        self._remember(data)
+        return data
+
     def write(self, data: typing.Dict) -> None:
         temp_file = f"{self.file_path}.tmp"
-        with open(temp_file, 'w') as file:
-            try:
-                json.dump(data, file, indent=4)
-            except (TypeError, ValueError) as e:
-                print(f"[!] Invalid JSON data for {self.file_path}: {e}")
-                return    
+        try:
+            blob = dump_json_bytes(data)
+        except (TypeError, ValueError) as e:
+            print(f"[!] Invalid JSON data for {self.file_path}: {e}")
+            return
+        with open(temp_file, 'wb') as file:
+            file.write(blob)
         os.replace(temp_file, self.file_path)
-        self.cache[self.file_path] = data
+        self._remember(data)
+
+    def _remember(self, data: typing.Dict) -> None:
+        self._snapshot = (data, time.monotonic() + self.ttl_seconds)
 
     def initialize(self) -> None:
         if not (os.path.exists(self.file_path) and os.path.getsize(self.file_path) > 0):
-            with open(self.file_path, 'w') as file:
-                json.dump(self.default_data, file, indent=4)
+            with open(self.file_path, 'wb') as file:
+                file.write(dump_json_bytes(self.default_data))
 
 cache_handler = JsonFileHandler(
     CACHE_JSON,
-    CACHE_CACHE,
+    CACHE_TTL_SECONDS,
     {"TRACKING": {}}
 )
 
@@ -172,11 +201,16 @@ def split_list_by_items(lst: list, num_items: int = 40) -> list:
     """
     return [lst[i:i + num_items] for i in range(0, len(lst), num_items)]
 
+NON_ALPHANUMERIC_PATTERN = re.compile(r"[^a-zA-Z0-9]")
+NON_ALPHANUMERIC_TABLE = dict.fromkeys(
+    code for code in range(128) if not chr(code).isalnum()
+)
+
 def remove_non_alphanumeric(text: str) -> str:
     """
     Remove all non-alphanumeric characters from the input text.
 
-    This function uses a regular expression to replace any character that is not a letter (a-z, A-Z) or a digit (0-9) with an empty string, effectively removing it from the input text.
+    This function removes any character that is not a letter (a-z, A-Z) or a digit (0-9). ASCII input, which covers virtually all tracking numbers, goes through a precomputed `str.translate` table; anything else falls back to a precompiled regular expression.
 
     Parameters:
     text (str): The input text from which to remove non-alphanumeric characters.
@@ -184,13 +218,16 @@ def remove_non_alphanumeric(text: str) -> str:
     Returns:
     str: The input text with all non-alphanumeric characters removed.
     """
-    return re.sub(r"[^a-zA-Z0-9]", "", text)
+    text = text.translate(NON_ALPHANUMERIC_TABLE)
+    if text.isascii():
+        return text
+    return NON_ALPHANUMERIC_PATTERN.sub("", text)
 
 def map_courier_slug_to_code(courier_slug: str) -> int:
     """
     Map a courier slug to the corresponding courier code.
 
-    This function takes a courier slug as input and searches the `courier_cache` global variable for a matching courier. If a match is found, the function returns the corresponding courier code. If no match is found or the input `courier_slug` is falsy (e.g., `None` or an empty string), the function returns 0.
+    This function takes a courier slug as input and looks up a matching courier in the `courier_code_by_slug` index. If a match is found, the function returns the corresponding courier code. If no match is found or the input `courier_slug` is falsy (e.g., `None` or an empty string), the function returns 0.
 
     Parameters:
     courier_slug (str): The courier slug to map to a courier code.
@@ -198,16 +235,10 @@ def map_courier_slug_to_code(courier_slug: str) -> int:
     Returns:
     int: The courier code corresponding to the input slug, or 0 if no match is found or the input is falsy.
     """
-    global courier_cache
-
     if not courier_slug:
         return 0
 
-    for courier in courier_cache:
-        if courier.get("_name").casefold() == courier_slug.casefold():
-            return courier.get("key")
-
-    return 0
+    return courier_code_by_slug.get(courier_slug.casefold(), 0)
 
 def remap_tracking_data(tracking_data: list) -> list:
     """
@@ -224,64 +255,292 @@ def remap_tracking_data(tracking_data: list) -> list:
     Returns:
     list: A list of remapped tracking data dictionaries.
     """
-    remapped_tracking_data = []
-    for tracking in tracking_data:
-        remapped_tracking_data.append({
-            "num": remove_non_alphanumeric(tracking.get("num")),
+    return [
+        {
+            "num": remove_non_alphanumeric(tracking["num"]),
             "fc": map_courier_slug_to_code(tracking.get("slug")),
             "sc": 0,
-        })
-    return remapped_tracking_data
+        }
+        for tracking in tracking_data
+    ]
+
+def parse_country_info(code: str) -> dict:
+    """
+    Parse the country information from the country cache.
+
+    Parameters:
+    code (str): The country code to look up.
+
+    Returns:
+    dict: A dictionary containing the country information, with the following keys:
+        - mnemonic (str): The country mnemonic.
+        - name (str): The country name.
+        - code (str): The country code.
+
+    If the country code is not found in the cache, the function returns `None`. The returned dictionary is shared between calls and must not be modified.
+    """
+    return _country_info(str(code))
+
+@functools.lru_cache(maxsize=None)
+def _country_info(code: str) -> typing.Optional[dict]:
+    country = country_by_number_key.get(code)
+    if country is None:
+        return None
+
+    return {
+        "mnemonic": country.get("_mnemonic"),
+        "name": country.get("_name"),
+        "code": country.get("_numberKey"),
+    }
+
+def parse_courier_info(code: str) -> dict:
+    """
+    Parse the courier information from the courier cache.
+
+    Parameters:
+    code (str): The courier code to look up.
 
-def capture_last_event_id(
-    url: str = "https://m.17track.net/en/track-details#nums=1Z9999999999999999"
-) -> typing.Optional[str]:
+    Returns:
+    dict: A dictionary containing the courier information, with the following keys:
+        - code (str): The courier code.
+        - country (dict): A dictionary containing the country information for the courier, with the following keys:
+            - mnemonic (str): The country mnemonic.
+            - name (str): The country name.
+            - code (str): The country code.
+        - contact (dict): A dictionary containing the courier contact information, with the following keys:
+            - email (str): The courier's email address.
+            - telephone (str): The courier's telephone number.
+            - website (str): The courier's website.
+        - name (str): The courier name.
+        - icon (str): The URL of the courier's logo image.
+
+    If the courier code is not found in the cache, the function returns `None`. The returned dictionary is shared between calls and must not be modified.
+    """
+    return _courier_info(str(code))
+
+@functools.lru_cache(maxsize=None)
+def _courier_info(code: str) -> typing.Optional[dict]:
+    courier = courier_by_key.get(code)
+    if courier is None:
+        return None
+
+    return {
+        "code": courier.get("key"),
+        "country": parse_country_info(courier.get("_country")),
+        "contact": {
+            "email": courier.get("_email"),
+            "telephone": courier.get("_tel"),
+            "website": courier.get("_url"),
+        },
+        "name": courier.get("_name"),
+        "icon": f"http://res.17track.net/asset/carrier/logo/120x120/{code}.png",
+    }
+
+def parse_status_info(code: int) -> dict:
+    """
+    Parse the status information from the status cache.
+
+    Parameters:
+    code (int): The status code to look up.
+
+    Returns:
+    dict: A dictionary containing the status information, with the following keys:
+        - code (int): The status code.
+        - name (str): The status name.
+        - color (str): The status icon background color.
+        - tips (str): The status tips.
+
+    If the status code is not found in the cache, the function returns `None`. The returned dictionary is shared between calls and must not be modified.
+    """
+    return _status_info(int(code))
+
+@functools.lru_cache(maxsize=None)
+def _status_info(code: int) -> typing.Optional[dict]:
+    status = status_by_key.get(code)
+    if status is None:
+        return None
+
+    return {
+        "code": status.get("key"),
+        "name": status.get("_name"),
+        "color": status.get("_iconBgColor"),
+        "tips": status.get("_tips"),
+    }
+
+def warm_lookup_caches() -> None:
+    """Build the parsed country, courier and status entries up front"""
+    for code in country_by_number_key:
+        _country_info(code)
+    for code in courier_by_key:
+        _courier_info(code)
+    for code in status_by_key:
+        _status_info(code)
+
+warm_lookup_caches()
+
+LAST_EVENT_ID_URL = "https://m.17track.net/en/track-details#nums=1Z9999999999999999"
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+SCRIPT_URL_PATTERN = re.compile(r"""<script[^>]+src=["']([^"']*res\.17track\.net/[^"']+\.js[^"']*)["']""", re.IGNORECASE)
+# Event IDs issued by 17track are long lowercase hex strings; anything else
+# next to a "last-event-id" key is not one and must not be cached
+LAST_EVENT_ID_FORMAT = r"[0-9a-f]{32,}"
+LAST_EVENT_ID_PATTERN = re.compile(
+    r"""last-event-id["']?\]?\s*[:=]\s*["'](""" + LAST_EVENT_ID_FORMAT + r""")["']""",
+    re.IGNORECASE,
+)
+
+async def scrape_last_event_id(url: str = LAST_EVENT_ID_URL) -> typing.Optional[str]:
+    """
+    Scrape the last event ID from the 17track website with plain HTTP requests.
+
+    This function downloads the tracking page, then every JavaScript bundle it loads from res.17track.net (concurrently), and searches them for a hard-coded "last-event-id" value in the lowercase hex format of 17track event IDs.
+
+    Parameters:
+    url (str, optional): The tracking page to start from. Defaults to `LAST_EVENT_ID_URL`.
+
+    Returns:
+    Optional[str]: The scraped last event ID, or `None` if none of the documents contain it.
+    """
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": BROWSER_USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=10),
+    ) as session:
+        async def fetch_text(document_url: str) -> str:
+            async with session.get(document_url) as response:
+                response.raise_for_status()
+                return await response.text()
+
+        page = await fetch_text(url)
+        script_urls = {
+            urllib.parse.urljoin(url, script_url)
+            for script_url in SCRIPT_URL_PATTERN.findall(page)
+        }
+        scripts = await asyncio.gather(
+            *map(fetch_text, script_urls), return_exceptions=True
+        )
+
+    for document in [page, *scripts]:
+        if isinstance(document, BaseException):
+            continue
+        for match in LAST_EVENT_ID_PATTERN.finditer(document):
+            if re.fullmatch(LAST_EVENT_ID_FORMAT, match.group(1)):
+                return match.group(1)
+    return None
+
+def capture_last_event_id(url: str = LAST_EVENT_ID_URL) -> typing.Optional[str]:
+    """
+    Capture the last event ID from the 17track website.
+
+    This function first tries `scrape_last_event_id`, which only needs a few plain HTTP requests. Launching a browser costs seconds and hundreds of MB, so `capture_last_event_id_with_browser` is only used when scraping does not find the ID.
+
+    Parameters:
+    url (str, optional): The tracking page to capture the ID from. Defaults to `LAST_EVENT_ID_URL`.
+
+    Returns:
+    Optional[str]: The captured last event ID, or `None` if it could not be obtained.
+    """
+    try:
+        last_event_id = asyncio.run(scrape_last_event_id(url))
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"[!] Failed to scrape last event ID: {e}")
+        last_event_id = None
+    if last_event_id:
+        return last_event_id
+    print("[!] Last event ID not found in page scripts. Falling back to browser capture...")
+    return capture_last_event_id_with_browser(url)
+
+BROWSER_ARGS = [
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-web-security",
+    "--disable-features=IsolateOrigins",
+    "--disable-site-isolation-trials",
+    f"--user-agent={BROWSER_USER_AGENT}",
+]
+
+# Only documents and scripts from 17track are loaded while capturing
+BROWSER_ALLOWED_HOSTS = frozenset({"m.17track.net", "res.17track.net", "t.17track.net"})
+BROWSER_BLOCKED_EXTENSIONS = re.compile(r"\.(?:css|json|png|svg)")
+# A capture holds the single browser thread; bound it so shutdown (which closes
+# the browser on that thread) never waits on a hung navigation
+BROWSER_NAVIGATION_TIMEOUT_MS = 20000
+BROWSER_CLOSE_TIMEOUT_SECONDS = BROWSER_NAVIGATION_TIMEOUT_MS / 1000 + 5
+
+# Playwright's sync API objects may only be used from the thread that created
+# them, so the long-lived browser is owned by a single dedicated thread
+browser_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+browser_state = {"playwright": None, "browser": None}
+
+def get_browser():
+    """Get the shared headless Chromium, launching it on first use (browser thread only)"""
+    browser = browser_state["browser"]
+    if browser is None or not browser.is_connected():
+        # Imported lazily, the browser is only a fallback
+        import playwright.sync_api
+
+        if browser_state["playwright"] is None:
+            browser_state["playwright"] = playwright.sync_api.sync_playwright().start()
+        browser = browser_state["playwright"].chromium.launch(headless=True, args=BROWSER_ARGS)
+        browser_state["browser"] = browser
+    return browser
+
+def close_browser() -> None:
+    """Close the shared Chromium and stop Playwright, if they were started"""
+    def close():
+        if browser_state["browser"] is not None:
+            browser_state["browser"].close()
+        if browser_state["playwright"] is not None:
+            browser_state["playwright"].stop()
+        browser_state["browser"] = browser_state["playwright"] = None
+
+    try:
+        browser_executor.submit(close).result(timeout=BROWSER_CLOSE_TIMEOUT_SECONDS)
+    except concurrent.futures.TimeoutError:
+        print("[!] Timed out waiting for the browser capture to finish, browser not closed.")
+
+def capture_last_event_id_with_browser(url: str = LAST_EVENT_ID_URL) -> typing.Optional[str]:
     """
     Capture the last event ID from the 17track website using Playwright.
 
-    This function launches a headless Chromium browser, navigates to the specified URL, and intercepts all network requests made by the page. If a request is made to the 17track API endpoint for tracking information, the function extracts the "last-event-id" header value from the request and returns it.
+    This function opens a fresh context in the shared headless Chromium browser (see `get_browser`), navigates to the specified URL, and intercepts all network requests made by the page. If a request is made to the 17track API endpoint for tracking information, the function extracts the "last-event-id" header value from the request and returns it.
 
     Parameters:
-    url (str, optional): The URL to navigate to in the Chromium browser. Defaults to "https://m.17track.net/en/track-details#nums=1Z9999999999999999".
+    url (str, optional): The URL to navigate to in the Chromium browser. Defaults to `LAST_EVENT_ID_URL`.
 
     Returns:
     Optional[str]: The captured last event ID, or `None` if it could not be obtained.
     """
-    last_event_id = None
-    with playwright.sync_api.sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-blink-features=AutomationControlled",
-                "--disable-web-security",
-                "--disable-features=IsolateOrigins",
-                "--disable-site-isolation-trials",
-                "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            ],
-        )
-        context = browser.new_context()
-        page = context.new_page()
-
-        def log_request(route, request):
-            nonlocal last_event_id
-            if not any(ext in request.url for ext in [".css", ".json", ".png", ".svg"]) and any(
-                domain in request.url for domain in ["https://m.17track.net", "https://res.17track.net", "https://t.17track.net"]
-            ):
-                route.continue_()
-                if request.url == "https://t.17track.net/restapi/track" and request.method == "POST":
-                    captured_headers = request.headers
-                    if captured_headers and "last-event-id" in captured_headers:
-                        last_event_id = captured_headers["last-event-id"]
-            else:
-                route.abort()
-
-        page.route("**/*", log_request)
-        page.goto(url)
-        browser.close()
-    return last_event_id
+    def capture() -> typing.Optional[str]:
+        last_event_id = None
+        context = get_browser().new_context()
+        try:
+            page = context.new_page()
+
+            def log_request(route, request):
+                nonlocal last_event_id
+                url = urllib.parse.urlsplit(request.url)
+                if (
+                    url.scheme == "https"
+                    and url.netloc in BROWSER_ALLOWED_HOSTS
+                    and not BROWSER_BLOCKED_EXTENSIONS.search(request.url)
+                ):
+                    route.continue_()
+                    if request.url == "https://t.17track.net/restapi/track" and request.method == "POST":
+                        captured_headers = request.headers
+                        if captured_headers and "last-event-id" in captured_headers:
+                            last_event_id = captured_headers["last-event-id"]
+                else:
+                    route.abort()
+
+            page.route("**/*", log_request)
+            page.goto(url, timeout=BROWSER_NAVIGATION_TIMEOUT_MS)
+        finally:
+            context.close()
+        return last_event_id
+
+    return browser_executor.submit(capture).result()
 
 def save_last_event_id(
     read_cache_json, 
@@ -303,19 +562,29 @@ def save_last_event_id(
     cache_data["TRACKING"] = tracking_cache
     write_cache_json(cache_data)
 
-def check_last_event_id_expiry(read_cache_json, write_cache_json, hours: int = 1) -> str:
+LAST_EVENT_ID_MAX_ATTEMPTS = 10
+LAST_EVENT_ID_MAX_BACKOFF_SECONDS = 60
+
+async def check_last_event_id_expiry(read_cache_json, write_cache_json, hours: int = 1) -> str:
     """
     Check the expiration of the last event ID and, if necessary, update it.
 
     This function first loads the last event ID and its expiration timestamp from storage. If the last event ID is not available or has expired (based on the provided `hours` parameter), it calls the `capture_last_event_id` function to obtain a new last event ID, and then saves the new last event ID and its expiration timestamp to storage.
 
+    Captures run in a worker thread so they never block the event loop. Failed captures are retried with exponential backoff (1s, 2s, 4s, ... capped at `LAST_EVENT_ID_MAX_BACKOFF_SECONDS`), up to `LAST_EVENT_ID_MAX_ATTEMPTS` times.
+
     Parameters:
     hours (int, optional): The number of hours after which the last event ID is considered expired. Defaults to 1.
 
     Returns:
     str: The current valid last event ID.
+
+    Raises:
+    Exception: If no last event ID could be captured within `LAST_EVENT_ID_MAX_ATTEMPTS` attempts.
     """
-    last_event_id, last_event_id_expiry = read_cache_json().get("TRACKING").get("last_event_id"), read_cache_json().get("TRACKING").get("last_event_id_expiry")
+    tracking_cache = read_cache_json().get("TRACKING", {})
+    last_event_id = tracking_cache.get("last_event_id")
+    last_event_id_expiry = tracking_cache.get("last_event_id_expiry")
 
     if (
         not last_event_id
@@ -328,9 +597,24 @@ def check_last_event_id_expiry(read_cache_json, write_cache_json, hours: int = 1
     ):
         print("[!] Last event ID not found or expired. Capturing new last event ID...")
         new_last_event_id = None
-        while not new_last_event_id:
-            print("[+] Capturing new last event ID...")
-            new_last_event_id = capture_last_event_id()
+        delay = 1
+        for attempt in range(LAST_EVENT_ID_MAX_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, LAST_EVENT_ID_MAX_BACKOFF_SECONDS)
+            print(f"[+] Capturing new last event ID (attempt {attempt + 1}/{LAST_EVENT_ID_MAX_ATTEMPTS})...")
+            try:
+                new_last_event_id = await asyncio.to_thread(capture_last_event_id)
+            except Exception as e:
+                # The browser fallback raises on outages (navigation errors, timeouts, launch failures); back off like a miss
+                print(f"[!] Failed to capture last event ID: {e}")
+                continue
+            if new_last_event_id:
+                break
+        else:
+            raise Exception(
+                f"failed to capture last event ID after {LAST_EVENT_ID_MAX_ATTEMPTS} attempts"
+            )
         print(f"[+] New last event ID captured: {new_last_event_id}. Saving to cache...")
         save_last_event_id(
             read_cache_json,
@@ -344,11 +628,160 @@ def check_last_event_id_expiry(read_cache_json, write_cache_json, hours: int = 1
     else:
         return last_event_id
 
-def tracking(
+RETRY_TRACKING_RESULT = {
+    "tracking": None,
+    "delay": None,
+    "country1": None,
+    "country2": None,
+    "shorten_status": None,
+    "transit_time": None,
+    "courier1": None,
+    "courier2": None,
+    "all_status": None,
+    "lastest_status": None,
+    "picked_up": None,
+    "returned": None,
+    "retry_delay": True,
+}
+
+def retry_tracking_result(tracking_number: str) -> dict:
+    """
+    Build the result for a tracking number that 17track has not resolved yet and should be retried later.
+
+    Parameters:
+    tracking_number (str): The tracking number.
+
+    Returns:
+    dict: A copy of `RETRY_TRACKING_RESULT` for the given tracking number.
+    """
+    return dict(RETRY_TRACKING_RESULT, tracking=tracking_number)
+
+def parse_tracking_status(tracking_statuses: list) -> list:
+    """
+    Parse the tracking status information from the API response.
+
+    Parameters:
+    tracking_statuses (list): A list of dictionaries containing the raw tracking status information.
+
+    Returns:
+    list: A list of dictionaries, where each dictionary represents a parsed tracking status with the following keys:
+        - time (int): The timestamp of the tracking status.
+        - country (str): The country code of the tracking status.
+        - location1 (str): The first location of the tracking status.
+        - location2 (str): The second location of the tracking status.
+        - status (str): The status message of the tracking status.
+    """
+    parsed_statuses = []
+    for tracking_status in tracking_statuses:
+        if not tracking_status:
+            continue
+        tracking_status_location1 = tracking_status.get("c")
+        tracking_status_location2 = tracking_status.get("d")
+
+        # If location2 is present and location1 is not, move location2 to location1 and clear location2
+        if tracking_status_location2 and not tracking_status_location1:
+            tracking_status_location1 = tracking_status_location2
+            tracking_status_location2 = ""
+
+        parsed_statuses.append({
+            "time": tracking_status.get("a"),
+            "country": tracking_status.get("b"),
+            "location1": tracking_status_location1,
+            "location2": tracking_status_location2,
+            "status": tracking_status.get("z"),
+        })
+
+    return parsed_statuses
+
+def parse_tracking_result(tracking_number: str, tracking_delay: int, tracking_info: dict) -> dict:
+    """
+    Parse the tracking information of a single tracking number from the API response.
+
+    Parameters:
+    tracking_number (str): The tracking number.
+    tracking_delay (int): The delay flag reported by the API for this tracking number.
+    tracking_info (dict): The raw "track" object of this tracking number.
+
+    Returns:
+    dict: A dictionary with the parsed countries, couriers, statuses and flags of the tracking number.
+    """
+    tracking_country1 = tracking_info.get("b")
+    tracking_country2 = tracking_info.get("c")
+    tracking_shorten_status = tracking_info.get("e")
+    tracking_transit_time = tracking_info.get("f")
+    tracking_courier1 = tracking_info.get("w1")
+    tracking_courier2 = tracking_info.get("w2")
+    lastest_tracking_status = parse_tracking_status([tracking_info.get("z0")])
+    tracking_extra = tracking_info.get("zex") or {}
+    return {
+        "tracking": tracking_number,
+        "delay": tracking_delay,
+        "country1": parse_country_info(tracking_country1) if tracking_country1 else None,
+        "country2": parse_country_info(tracking_country2) if tracking_country2 else None,
+        "shorten_status": (
+            parse_status_info(tracking_shorten_status)
+            if tracking_shorten_status or tracking_shorten_status == 0
+            else {}
+        ),
+        "transit_time": (
+            tracking_transit_time
+            if tracking_transit_time is not None and tracking_transit_time >= 0
+            else None
+        ),
+        "courier1": parse_courier_info(tracking_courier1) if tracking_courier1 else None,
+        "courier2": parse_courier_info(tracking_courier2) if tracking_courier2 else None,
+        "all_status": parse_tracking_status(tracking_info.get("z1") or []),
+        "lastest_status": lastest_tracking_status[0] if len(lastest_tracking_status) == 1 else {},
+        "picked_up": bool(tracking_extra.get("pickup")),
+        "returned": bool(tracking_extra.get("return")),
+        "retry_delay": False,
+    }
+
+# Last event ID currently in use, kept in memory by the track rotation daemon
+current_last_event_id = None
+current_last_event_id_lock = asyncio.Lock()
+
+async def refresh_last_event_id(read_cache_json, write_cache_json, only_if_missing: bool = False) -> str:
+    """
+    Refresh the in-memory last event ID through `check_last_event_id_expiry`.
+
+    Both the track rotation daemon and `get_last_event_id` refresh through here, under `current_last_event_id_lock`, so at most one capture runs at a time.
+
+    Parameters:
+    only_if_missing (bool, optional): Skip the refresh if another caller has set the ID while this one waited for the lock.
+
+    Returns:
+    str: The current valid last event ID.
+    """
+    global current_last_event_id
+    async with current_last_event_id_lock:
+        if only_if_missing and current_last_event_id:
+            return current_last_event_id
+        current_last_event_id = await check_last_event_id_expiry(
+            read_cache_json,
+            write_cache_json,
+            read_cache_json().get("TRACKING", {}).get("TRACK_REFRESH_HOUR", 1)
+        )
+        return current_last_event_id
+
+async def get_last_event_id(read_cache_json, write_cache_json) -> str:
+    """
+    Get the last event ID to send with tracking requests.
+
+    The ID is normally served from memory, where the track rotation daemon keeps it up to date. Only when it is not known yet is it refreshed here, under a lock so that concurrent requests trigger a single refresh.
+
+    Returns:
+    str: The current valid last event ID.
+    """
+    if current_last_event_id:
+        return current_last_event_id
+    return await refresh_last_event_id(read_cache_json, write_cache_json, only_if_missing=True)
+
+async def tracking_async(
     read_cache_json,
     write_cache_json,
     trackings: list, 
-    headers: dict = {}, 
+    headers: dict = None, 
     proxies: dict = None
 ) -> dict:
     """
@@ -368,269 +801,34 @@ def tracking(
     if len(trackings) == 0 or len(trackings) > 40:
         raise Exception("invalid number of trackings provided")
     data = {}
-    cache_data = read_cache_json()
-    last_event_id, last_event_id_expiry = cache_data.get("last_event_id"), cache_data.get("last_event_id_expiry")
-    if not last_event_id or not last_event_id_expiry:
-        last_event_id = check_last_event_id_expiry(read_cache_json, write_cache_json)
+    headers = dict(headers or {})
     headers["Referer"] = "https://m.17track.net/"
-    headers["User-Agent"] = cache_data["TRACKING"]["User_Agent"]
-    headers["Last-Event-ID"] = last_event_id
+    headers["User-Agent"] = tracking_settings["user_agent"] or read_cache_json()["TRACKING"]["User_Agent"]
+    if not headers.get("Last-Event-ID"):
+        headers["Last-Event-ID"] = await get_last_event_id(read_cache_json, write_cache_json)
     data["data"] = remap_tracking_data(trackings)
     print(f"[+] Preparing {len(trackings)} trackings to be tracked")
-    if proxies:
-        patch_proxy_connection()
-        response = requests.post(
-            "https://t.17track.net/restapi/track",
-            json=data,
-            headers=headers,
-            timeout=10
-        )
-    else:
+    proxy = select_proxy(proxies)
+    if not proxy:
         print(f"[-] No proxy configured")
-        response = requests.post(
-            "https://t.17track.net/restapi/track", json=data, headers=headers
-        )
-    response_data = response.json()
+    async with get_http_session(proxy).post(
+        TRACK_API_URL,
+        json=data,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=10)
+    ) as response:
+        response_data = await response.json(loads=orjson.loads, content_type=None)
     if response_data.get("msg") == "Ok":
         all_trackings_results = {}
-
-        def parse_tracking_status(tracking_statuses: list) -> list:
-            """
-            Parse the tracking status information from the API response.
-
-            Parameters:
-            tracking_statuses (list): A list of dictionaries containing the raw tracking status information.
-
-            Returns:
-            list: A list of dictionaries, where each dictionary represents a parsed tracking status with the following keys:
-                - time (int): The timestamp of the tracking status.
-                - country (str): The country code of the tracking status.
-                - location1 (str): The first location of the tracking status.
-                - location2 (str): The second location of the tracking status.
-                - status (str): The status message of the tracking status.
-            """
-            parsed_statuses = []
-            for tracking_status in tracking_statuses:
-                if not tracking_status:
-                    continue
-                tracking_status_time = tracking_status.get("a")
-                tracking_status_country = tracking_status.get("b")
-                tracking_status_location1 = tracking_status.get("c")
-                tracking_status_location2 = tracking_status.get("d")
-                tracking_status_message = tracking_status.get("z")
-
-                # If location2 is present and location1 is not, move location2 to location1 and clear location2
-                if tracking_status_location2 and not tracking_status_location1:
-                    tracking_status_location1 = tracking_status_location2
-                    tracking_status_location2 = ""
-
-                parsed_statuses.append({
-                    "time": tracking_status_time,
-                    "country": tracking_status_country,
-                    "location1": tracking_status_location1,
-                    "location2": tracking_status_location2,
-                    "status": tracking_status_message,
-                })
-
-            return parsed_statuses
-
-        def parse_country_info(code: str) -> dict:
-            """
-            Parse the country information from the country cache.
-
-            Parameters:
-            code (str): The country code to look up.
-
-            Returns:
-            dict: A dictionary containing the country information, with the following keys:
-                - mnemonic (str): The country mnemonic.
-                - name (str): The country name.
-                - code (str): The country code.
-            
-            If the country code is not found in the cache, the function returns `None`.
-            """
-            global country_cache
-
-            for country in country_cache:
-                if str(country.get("_numberKey")) == str(code):
-                    return {
-                        "mnemonic": country.get("_mnemonic"),
-                        "name": country.get("_name"),
-                        "code": country.get("_numberKey"),
-                    }
-
-            return None
-
-        def parse_courier_info(code: str) -> dict:
-            """
-            Parse the courier information from the courier cache.
-
-            Parameters:
-            code (str): The courier code to look up.
-
-            Returns:
-            dict: A dictionary containing the courier information, with the following keys:
-                - code (str): The courier code.
-                - country (dict): A dictionary containing the country information for the courier, with the following keys:
-                    - mnemonic (str): The country mnemonic.
-                    - name (str): The country name.
-                    - code (str): The country code.
-                - contact (dict): A dictionary containing the courier contact information, with the following keys:
-                    - email (str): The courier's email address.
-                    - telephone (str): The courier's telephone number.
-                    - website (str): The courier's website.
-                - name (str): The courier name.
-                - icon (str): The URL of the courier's logo image.
-            
-            If the courier code is not found in the cache, the function returns `None`.
-            """
-            global courier_cache
-
-            for courier in courier_cache:
-                if str(courier.get("key")) == str(code):
-                    return {
-                        "code": courier.get("key"),
-                        "country": parse_country_info(courier.get("_country")),
-                        "contact": {
-                            "email": courier.get("_email"),
-                            "telephone": courier.get("_tel"),
-                            "website": courier.get("_url"),
-                        },
-                        "name": courier.get("_name"),
-                        "icon": f"http://res.17track.net/asset/carrier/logo/120x120/{code}.png",
-                    }
-
-            return None
-
-        def parse_status_info(code: int) -> dict:
-            """
-            Parse the status information from the status cache.
-
-            Parameters:
-            code (int): The status code to look up.
-
-            Returns:
-            dict: A dictionary containing the status information, with the following keys:
-                - code (int): The status code.
-                - name (str): The status name.
-                - color (str): The status icon background color.
-                - tips (str): The status tips.
-            
-            If the status code is not found in the cache, the function returns `None`.
-            """
-            global status_cache
-
-            for status in status_cache:
-                if int(status.get("key")) == int(code):
-                    return {
-                        "code": status.get("key"),
-                        "name": status.get("_name"),
-                        "color": status.get("_iconBgColor"),
-                        "tips": status.get("_tips"),
-                    }
-
-            return None
-
         for tracking in response_data.get("dat", {}):
             tracking_number = tracking.get("no")
-            tracking_delay = tracking.get("delay")
-            if tracking.get("delay") == 1:
-                for tracking in data["data"]:
-                    all_trackings_results[tracking_number] = {
-                        "tracking": tracking_number,
-                        "delay": None,
-                        "country1": None,
-                        "country2": None,
-                        "shorten_status": None,
-                        "transit_time": None,
-                        "courier1": None,
-                        "courier2": None,
-                        "all_status": None,
-                        "lastest_status": None,
-                        "picked_up": None,
-                        "returned": None,
-                        "retry_delay": True,
-                    }
-            else:
-                tracking_info = tracking.get("track", {})
-                if not tracking_info:
-                    all_trackings_results[tracking_number] = {
-                        "tracking": tracking_number,
-                        "delay": None,
-                        "country1": None,
-                        "country2": None,
-                        "shorten_status": None,
-                        "transit_time": None,
-                        "courier1": None,
-                        "courier2": None,
-                        "all_status": None,
-                        "lastest_status": None,
-                        "picked_up": None,
-                        "returned": None,
-                        "retry_delay": True,
-                    }
-                    continue
-                tracking_country1 = tracking_info.get("b")
-                tracking_country2 = tracking_info.get("c")
-                if tracking_country1:
-                    tracking_country1 = parse_country_info(tracking_country1)
-                else:
-                    tracking_country1 = None
-                if tracking_country2:
-                    tracking_country2 = parse_country_info(tracking_country2)
-                else:
-                    tracking_country2 = None
-                tracking_shorten_status = tracking_info.get("e")
-                if tracking_shorten_status or tracking_shorten_status == 0:
-                    tracking_shorten_status = parse_status_info(tracking_shorten_status)
-                else:
-                    tracking_shorten_status = {}
-                tracking_transit_time = tracking_info.get("f")
-                if tracking_transit_time < 0:
-                    tracking_transit_time = None
-                tracking_courier1 = tracking_info.get("w1")
-                tracking_courier2 = tracking_info.get("w2")
-                if tracking_courier1:
-                    tracking_courier1 = parse_courier_info(tracking_courier1)
-                else:
-                    tracking_courier1 = None
-                if tracking_courier2:
-                    tracking_courier2 = parse_courier_info(tracking_courier2)
-                else:
-                    tracking_courier2 = None
-                all_tracking_status = parse_tracking_status(tracking_info.get("z1"))
-                lastest_tracking_status = parse_tracking_status(
-                    [tracking_info.get("z0")]
-                )
-                if len(lastest_tracking_status) == 1:
-                    lastest_tracking_status = lastest_tracking_status[0]
-                else:
-                    lastest_tracking_status = {}
-                tracking_picked_up = tracking_info.get("zex", {}).get("pickup")
-                if tracking_picked_up:
-                    tracking_picked_up = True
-                else:
-                    tracking_picked_up = False
-                tracking_returned = tracking_info.get("zex", {}).get("return")
-                if tracking_returned:
-                    tracking_returned = True
-                else:
-                    tracking_returned = False
-                all_trackings_results[tracking_number] = {
-                    "tracking": tracking_number,
-                    "delay": tracking_delay,
-                    "country1": tracking_country1,
-                    "country2": tracking_country2,
-                    "shorten_status": tracking_shorten_status,
-                    "transit_time": tracking_transit_time,
-                    "courier1": tracking_courier1,
-                    "courier2": tracking_courier2,
-                    "all_status": all_tracking_status,
-                    "lastest_status": lastest_tracking_status,
-                    "picked_up": tracking_picked_up,
-                    "returned": tracking_returned,
-                    "retry_delay": False,
-                }
+            tracking_info = tracking.get("track")
+            if tracking.get("delay") == 1 or not tracking_info:
+                all_trackings_results[tracking_number] = retry_tracking_result(tracking_number)
+                continue
+            all_trackings_results[tracking_number] = parse_tracking_result(
+                tracking_number, tracking.get("delay"), tracking_info
+            )
         return all_trackings_results
     elif response_data.get("msg") == "numNon":
         raise Exception(f"invalid tracking number provided: {response_data.get('msg')}")
@@ -639,39 +837,133 @@ def tracking(
             f"error retrieving tracking information: {response_data.get('msg')}"
         )
 
-# Global state as dict for atomic updates
+# Parsed results per (tracking number, courier code); tracking states rarely change within minutes
+TRACKING_RESULT_CACHE_SIZE = 10000
+TRACKING_RESULT_CACHE_TTL_SECONDS = 300
+tracking_result_cache = cachetools.TTLCache(
+    maxsize=TRACKING_RESULT_CACHE_SIZE,
+    ttl=TRACKING_RESULT_CACHE_TTL_SECONDS,
+)
+
+def tracking_result_cache_key(tracking: dict) -> tuple:
+    """Key a requested tracking the same way it is sent to 17track: normalized number and courier code"""
+    return (remove_non_alphanumeric(tracking["num"]), map_courier_slug_to_code(tracking.get("slug")))
+
+async def tracking_many(
+    read_cache_json,
+    write_cache_json,
+    trackings: list,
+    headers: dict = None,
+    proxies: dict = None
+) -> dict:
+    """
+    Retrieve tracking information for any number of tracking numbers.
+
+    The trackings are split into batches of 40 (the 17track limit per request) and all batches are sent concurrently, so the total latency is bound by the slowest batch rather than the sum of all of them.
+
+    Results that were fetched within the last `TRACKING_RESULT_CACHE_TTL_SECONDS` are served from `tracking_result_cache` and only the remaining trackings are sent.
+
+    Parameters:
+    trackings (list): A list of tracking numbers.
+    headers (dict, optional): A dictionary of custom headers to include in the requests.
+    proxies (dict, optional): A dictionary of proxy settings to use for the requests.
+
+    Returns:
+    dict: A dictionary containing the tracking information for each provided tracking number.
+    """
+    all_trackings_results = {}
+    # Uncached trackings by cache key, in rounds. 17track answers by tracking
+    # number only, so the same number with another courier goes in a later
+    # round (a separate request) to keep each answer tied to its cache key.
+    pending_rounds = []
+    pending_round_numbers = []
+    for tracking in trackings:
+        cache_key = tracking_result_cache_key(tracking)
+        cached_result = tracking_result_cache.get(cache_key)
+        if cached_result is not None:
+            all_trackings_results[cached_result["tracking"]] = cached_result
+            continue
+        for pending_trackings, pending_numbers in zip(pending_rounds, pending_round_numbers):
+            if cache_key in pending_trackings or cache_key[0] not in pending_numbers:
+                break
+        else:
+            pending_trackings, pending_numbers = {}, set()
+            pending_rounds.append(pending_trackings)
+            pending_round_numbers.append(pending_numbers)
+        pending_trackings[cache_key] = tracking
+        pending_numbers.add(cache_key[0])
+    if not pending_rounds:
+        return all_trackings_results
+
+    pending_batches = [
+        (pending_trackings, batch)
+        for pending_trackings in pending_rounds
+        for batch in split_list_by_items(list(pending_trackings.values()))
+    ]
+    batch_results = await asyncio.gather(*[
+        tracking_async(read_cache_json, write_cache_json, batch, headers, proxies)
+        for _, batch in pending_batches
+    ])
+    for (pending_trackings, _), batch_result in zip(pending_batches, batch_results):
+        cache_keys = {cache_key[0]: cache_key for cache_key in pending_trackings}
+        for tracking_number, tracking_result in batch_result.items():
+            cache_key = cache_keys.get(tracking_number)
+            # Unresolved trackings must be asked again on the next request
+            if cache_key and not tracking_result.get("retry_delay"):
+                tracking_result_cache[cache_key] = tracking_result
+        all_trackings_results.update(batch_result)
+    return all_trackings_results
+
+# Tracking settings from cache.json that are needed on every request, kept in
+# memory and reloaded by the settings daemon instead of read per request
+TRACKING_SETTINGS_REFRESH_SECONDS = 30
+tracking_settings = {
+    "proxies": [],
+    "user_agent": None,
+}
+
+def load_tracking_settings() -> None:
+    """Reload the tracking proxies and user agent from cache.json into `tracking_settings`"""
+    tracking_config = read_cache_json().get("TRACKING", {})
+    tracking_settings["proxies"] = list(tracking_config.get("tracking_proxy") or [])
+    tracking_settings["user_agent"] = tracking_config.get("User_Agent")
+
+load_tracking_settings()
+
+# Per-daemon "cycle running" flags; all daemons share the event loop, so
+# is_set()/set() cannot interleave with another daemon's check
 daemon_states = {
-    "is_track_rotating": {"status": False},
+    "is_track_rotating": asyncio.Event(),
+    "is_settings_rotating": asyncio.Event(),
 }
 
-def rotate_daemon(exe_type, interval_seconds=15) -> None:
+async def rotate_daemon(exe_type, interval_seconds=15) -> None:
     global daemon_states
     exe_type_normalized = exe_type.lower().strip()
     state_key = f"is_{exe_type_normalized}_rotating"
     
     # Make sure the state exists
     if state_key not in daemon_states:
-        daemon_states[state_key] = {"status": False}
+        daemon_states[state_key] = asyncio.Event()
     
     print(f"[*] Starting daemon for {exe_type_normalized}")
     
     try:
         while True:
-            #with daemon_lock:
-            if daemon_states[state_key]["status"]:
+            running = daemon_states[state_key]
+            if running.is_set():
                 print(f"[!] Daemon already running for {exe_type_normalized}. Skipping cycle.")
-                time.sleep(1)
+                await asyncio.sleep(1)
                 continue
                 
             try:
-                daemon_states[state_key]["status"] = True
+                running.set()
                 if "track" in exe_type_normalized:
                     print("[+] Checking last event id expiry.")
-                    check_last_event_id_expiry(
-                        read_cache_json,
-                        write_cache_json,
-                        cache_handler.get("TRACKING", {}).get("TRACK_REFRESH_HOUR")
-                    )
+                    await refresh_last_event_id(read_cache_json, write_cache_json)
+                elif "settings" in exe_type_normalized:
+                    await asyncio.to_thread(load_tracking_settings)
+                    await retire_stale_http_sessions(tracking_settings["proxies"])
                 else:
                     print(f"[!] Unknown daemon type: {exe_type_normalized}")
                     print(f"[!] exe_type: {exe_type}, normalized: {exe_type_normalized}")
@@ -682,30 +974,22 @@ def rotate_daemon(exe_type, interval_seconds=15) -> None:
                 print(traceback.format_exc())
             finally:
                 #print(f"[DEBUG] Setting status to False for {exe_type_normalized}")
-                daemon_states[state_key]["status"] = False
+                running.clear()
                     
             #print(f"[DEBUG] Sleep for {interval_seconds} seconds for {exe_type_normalized}")
-            time.sleep(interval_seconds)
+            await asyncio.sleep(interval_seconds)
     except Exception as e:
         print(f"[!] Fatal error in rotate_daemon {exe_type_normalized}: {e}")
 
-def run_daemon_loop() -> None:
-    """Master daemon that starts all worker threads"""
-    try:
-        print("[+] Starting master daemon loop...")
-        
+def run_daemon_loop() -> typing.List[asyncio.Task]:
+    """Start all daemons as background tasks on the running event loop"""
+    print("[+] Starting master daemon loop...")
+    return [
         # Start track rotation daemon
-        threading.Thread(
-            target=rotate_daemon,
-            args=("Track", 3600),
-            daemon=True
-        ).start()
-
-        while True:
-            time.sleep(60)
-            
-    except Exception as e:
-        print(f"[!] Error in master daemon: {e}.")
+        asyncio.create_task(rotate_daemon("Track", 60)),
+        # Start tracking settings reload daemon
+        asyncio.create_task(rotate_daemon("Settings", TRACKING_SETTINGS_REFRESH_SECONDS)),
+    ]
 
 
 def pick_random_proxy(proxies):
@@ -716,39 +1000,68 @@ def pick_random_proxy(proxies):
 
 def get_next_proxy(proxies):
     global current_proxy_index
-    proxy = proxies[current_proxy_index]
-    current_proxy_index = (current_proxy_index + 1) % len(proxies)
+    # The settings daemon can swap in a shorter list, so wrap a stale index
+    index = current_proxy_index % len(proxies)
+    proxy = proxies[index]
+    current_proxy_index = (index + 1) % len(proxies)
     return proxy
 
 
 
-app = flask.Flask(__name__)
+@contextlib.asynccontextmanager
+async def lifespan(app: fastapi.FastAPI) -> typing.AsyncIterator[None]:
+    daemon_tasks = run_daemon_loop()
+    yield
+    for task in daemon_tasks:
+        task.cancel()
+    await asyncio.gather(*daemon_tasks, return_exceptions=True)
+    await close_http_sessions()
+    await asyncio.to_thread(close_browser)
+
+app = fastapi.FastAPI(lifespan=lifespan)
+# Batched tracking responses are repetitive JSON and compress well
+app.add_middleware(fastapi.middleware.gzip.GZipMiddleware, minimum_size=500)
+
+class PackageInformationResponse(pydantic.BaseModel):
+    status: str
+    message: str
+    data: typing.Optional[typing.Dict[str, typing.Any]] = None
 
-@app.route("/v1/package/information", methods=["GET"])
-def api_package_info() -> typing.Tuple[flask.Response, int]:
+def package_information_response(status_code: int, **fields) -> fastapi.responses.Response:
+    """
+    Serialize a PackageInformationResponse with orjson and the given HTTP status code.
+
+    Only a missing top-level "data" is left out, as the Flask version did; None values inside the tracking results are kept.
+    """
+    response = PackageInformationResponse(**fields)
+    return fastapi.responses.Response(
+        content=orjson.dumps(response.model_dump(exclude={"data"} if response.data is None else None)),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+@app.api_route("/v1/package/information", methods=["GET", "POST"], response_model=PackageInformationResponse)
+async def api_package_info(request: fastapi.Request) -> fastapi.responses.Response:
+    """Track every number in the request body concurrently and return them keyed by tracking number"""
     try:
-        data = flask.request.json
+        data = await request.json()
         tracking_information = data.get("tracking_information", None)
         if not tracking_information:
             missing_fields = []
             if not tracking_information:
                 missing_fields.append("tracking_information")
-            return (
-                flask.jsonify(
-                    status="error",
-                    message=f"failed to fetch package: missing field(s): {', '.join(missing_fields)}",
-                ),
+            return package_information_response(
                 404,
-            )   
+                status="error",
+                message=f"failed to fetch package: missing field(s): {', '.join(missing_fields)}",
+            )
         mapped_tracking_information = []
         for item in tracking_information:
             if "tracking" not in item:
-                return (
-                    flask.jsonify(
-                        status="error",
-                        message="failed to fetch package: tracking not specified",
-                    ),
+                return package_information_response(
                     404,
+                    status="error",
+                    message="failed to fetch package: tracking not specified",
                 )
             tracking_mapping = {
                 "num": item.get("tracking", ""),
@@ -756,33 +1069,36 @@ def api_package_info() -> typing.Tuple[flask.Response, int]:
             }
             mapped_tracking_information.append(tracking_mapping)
 
-        tracking_proxies = read_cache_json()
-        random_proxy = get_next_proxy(tracking_proxies["TRACKING"]["tracking_proxy"])
-        tracking_status_information = tracking(
+        tracking_proxies = tracking_settings["proxies"]
+        random_proxy = get_next_proxy(tracking_proxies) if tracking_proxies else None
+        tracking_status_information = await tracking_many(
             read_cache_json=read_cache_json,
             write_cache_json=write_cache_json,
             trackings=mapped_tracking_information,
-            proxies={"all": [random_proxy]}
+            proxies={"all": random_proxy}
         )
         if not tracking_status_information:
-            return (
-                flask.jsonify(
-                    status="error",
-                    message="failed to fetch package: tracking information not found",
-                ),
+            return package_information_response(
                 404,
+                status="error",
+                message="failed to fetch package: tracking information not found",
             )
-        return (
-            flask.jsonify(
-                status="success",
-                message="successfully fetched packages",
-                data=tracking_status_information,
-            ),
+        return package_information_response(
             200,
+            status="success",
+            message="successfully fetched packages",
+            data=tracking_status_information,
         )
     except Exception as e:
-        return flask.jsonify(status="error", message=f"failed to fetch packages: {e}"), 500
+        return package_information_response(500, status="error", message=f"failed to fetch packages: {e}")
 
 print("[*] Starting server...")
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=5000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+    )
@@ -0,0 +1,26 @@
+import os
+
+# Production entrypoints:
+#   gunicorn -c gunicorn_conf.py app:app
+#   GUNICORN_WORKER_CLASS=sync GUNICORN_BIND=0.0.0.0:5001 gunicorn -c gunicorn_conf.py pdf_generator:app
+#
+# app.py is an ASGI app, so it needs the uvicorn worker. It runs as a single
+# process by default: every worker would start its own lifespan daemons (event
+# ID rotation, headless Chromium) and rewrite the same cache.json, so only scale
+# it out once that state lives outside the process. Its requests are I/O-bound
+# and already concurrent on the event loop.
+#
+# pdf_generator.py is a CPU-bound Flask app where every worker renders batches
+# in its own cpu_count()-sized process pool, so the other worker classes
+# default to a small fixed count instead of scaling with the CPUs again.
+
+UVICORN_WORKER_CLASS = "uvicorn_worker.UvicornWorker"
+LABEL_WORKERS = 2
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", UVICORN_WORKER_CLASS)
+default_workers = 1 if worker_class == UVICORN_WORKER_CLASS else LABEL_WORKERS
+workers = int(os.environ.get("WEB_CONCURRENCY", default_workers))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+keepalive = 30
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
@@ -1,25 +1,93 @@
 import os
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, send_file
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib.pagesizes import letter
 from reportlab.graphics.barcode import code128
 from reportlab.graphics.shapes import Drawing
 from reportlab.graphics import renderPDF
-from PyPDF2 import PdfReader, PdfWriter
+import pikepdf
+import orjson
 from io import BytesIO
 from pystrich.datamatrix import DataMatrixEncoder
 from datetime import datetime
 import zipfile
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 
 app = Flask(__name__)
 
 
+def ojsonify(obj, status=200):
+    return Response(orjson.dumps(obj), status, mimetype="application/json")
+
+TEMPLATE_PATH = "sample_template.pdf"
+
+
+# The Data Matrix only depends on its data, so repeated labels (re-prints, the
+# same zip + tracking number) reuse the encoded PNG bytes instead of re-encoding.
+# Code128 flowables are not cached: drawOn keeps the target canvas on the
+# object, so a shared instance is unsafe across concurrent requests.
+@lru_cache(maxsize=4096)
+def data_matrix_png(barcode_data_code):
+    return DataMatrixEncoder(barcode_data_code).get_imagedata()
+
+
+# Caption text that is the same on every label: (x, y, font size, text).
+# It is drawn into the template once and each label only draws the values.
+STATIC_LABEL_TEXT = {
+    "ship_date": (188, 318, 9, "Ship Date: "),
+    "weight": (225, 304, 9, "Weight: "),
+    "dimensions": (186, 293, 9, "Dimensions: "),
+    "ship_to": (10, 240, 8, "SHIP TO:"),
+}
+
+
+def static_text_end(key):
+    # Where the value that follows a static caption starts
+    x, _, font_size, text = STATIC_LABEL_TEXT[key]
+    return x + stringWidth(text, "Helvetica", font_size)
+
+
+SHIP_DATE_X = static_text_end("ship_date")
+WEIGHT_X = static_text_end("weight")
+DIMENSIONS_X = static_text_end("dimensions")
+
+
+def overlay_pdf(template_bytes, packet, output):
+    with pikepdf.open(BytesIO(template_bytes)) as existing_pdf, pikepdf.open(packet) as new_pdf:
+        # Place the letter-sized overlay at its native size instead of fitting it to the page
+        overlay = new_pdf.pages[0]
+        existing_pdf.pages[0].add_overlay(overlay, pikepdf.Rectangle(*overlay.mediabox))
+        existing_pdf.save(output)
+
+
 class USPSLabelGenerator:
     def __init__(self, template_path):
         self.template_path = template_path
+        # Read the template once and merge the static captions into it; each
+        # label parses its own copy from memory
+        with open(template_path, "rb") as template_file:
+            template_bytes = template_file.read()
+        self._template_bytes = self._render_static_template(template_bytes)
+
+    @staticmethod
+    def _render_static_template(template_bytes):
+        packet = BytesIO()
+        can = canvas.Canvas(packet, pagesize=letter)
+        can.setFont("Helvetica", 9)
+        for x, y, font_size, text in STATIC_LABEL_TEXT.values():
+            can.setFontSize(font_size)
+            can.drawString(x, y, text)
+        can.save()
+        packet.seek(0)
+
+        output = BytesIO()
+        overlay_pdf(template_bytes, packet, output)
+        return output.getvalue()
         
-    def generate_label(self, output_path, shipping_data):
+    def generate_label(self, output, shipping_data):
         packet = BytesIO()
         can = canvas.Canvas(packet, pagesize=letter)
         
@@ -28,17 +96,17 @@ class USPSLabelGenerator:
         
         # Add ship date (assuming current date for now)
         current_date = datetime.now().strftime("%d/%m/%Y")
-        can.drawString(188, 318, f"Ship Date: {current_date}")
+        can.drawString(SHIP_DATE_X, 318, current_date)
         
         # Add weight
-        can.drawString(225, 304, f"Weight: {shipping_data.get('weight', 'N/A')} lb")
+        can.drawString(WEIGHT_X, 304, f"{shipping_data.get('weight', 'N/A')} lb")
         
         # Add dimensions (if length, height, and width are provided)
         dimensions = f"{shipping_data.get('length', 'N/A')}x{shipping_data.get('height', 'N/A')}x{shipping_data.get('width', 'N/A')}"
-        can.drawString(186, 293, f"Dimensions: {dimensions}")
+        can.drawString(DIMENSIONS_X, 293, dimensions)
         
-        # Add sender information
-        can.setFont("Helvetica", 8)
+        # Add sender information (sender and recipient share the 8pt size)
+        can.setFontSize(8)
         can.drawString(10, 318, f"{shipping_data.get('fromName', 'N/A')}")
         can.drawString(10, 308, f"{shipping_data.get('fromAddress', 'N/A')}")
         if shipping_data.get('fromAddress2'):
@@ -49,18 +117,16 @@ class USPSLabelGenerator:
         
         
         # Add recipient information
-        can.setFont("Helvetica", 8)
-        can.drawString(10, 240, "SHIP TO:")
         can.drawString(50, 238, f"{shipping_data.get('toName', 'N/A')}")
         can.drawString(50, 228, f"{shipping_data.get('toAddress', 'N/A')}")
         if shipping_data.get('toAddress2'):
             can.drawString(50, 218, f"{shipping_data['toAddress2']}")
             # Add recipient city, state, and zip with large font
-            can.setFont("Helvetica", 12.5)
+            can.setFontSize(12.5)
             can.drawString(50, 206, f"{shipping_data.get('toCity', 'N/A')} {shipping_data.get('toState', 'N/A')} {shipping_data.get('toZip', 'N/A')}")
         else:
             # Add recipient city, state, and zip with large font
-            can.setFont("Helvetica", 12.5)
+            can.setFontSize(12.5)
             can.drawString(50, 214, f"{shipping_data.get('toCity', 'N/A')} {shipping_data.get('toState', 'N/A')} {shipping_data.get('toZip', 'N/A')}")
         
         # Generate Data Matrix Code using pystrich
@@ -68,16 +134,13 @@ class USPSLabelGenerator:
         tracking_number = tracking_number.replace(" ", "")
         gs_char = chr(29)
         barcode_data_code = f"420{shipping_data.get('toZip', 'N/A')}{gs_char}{tracking_number}"
-        data_matrix = DataMatrixEncoder(barcode_data_code)
-        data_matrix_path = "data_matrix.png"
-        data_matrix.save(data_matrix_path)
         
         # Add the Data Matrix image to the PDF
-        data_matrix_img = ImageReader(data_matrix_path)
+        data_matrix_img = ImageReader(BytesIO(data_matrix_png(barcode_data_code)))
         can.drawImage(data_matrix_img, 7, 200, width=35, height=35)
         can.drawImage(data_matrix_img, 245, 5, width=35, height=35)
 
-        # Add tracking number and barcode
+        # Add tracking number and barcode; the only font face switch
         can.setFont("Helvetica-Bold", 12)
         
         # Generate the barcode in format of GS1-128 format
@@ -100,20 +163,34 @@ class USPSLabelGenerator:
         
         packet.seek(0)
         
-        new_pdf = PdfReader(packet)
-        
-        existing_pdf = PdfReader(self.template_path)
-        
-        output = PdfWriter()
-        
-        page = existing_pdf.pages[0]
-        page.merge_page(new_pdf.pages[0])
-        output.add_page(page)
-        
-        with open(output_path, "wb") as output_file:
-            output.write(output_file)
+        overlay_pdf(self._template_bytes, packet, output)
             
-        return output_path
+        return output
+
+
+@lru_cache(maxsize=None)
+def get_label_generator(template_path):
+    # One generator (and template read) per template and process
+    return USPSLabelGenerator(template_path)
+
+
+def render_label(template_path, shipping_data):
+    # Module-level so it can be pickled into the worker processes; returns the
+    # PDF bytes so nothing touches the disk
+    output = BytesIO()
+    get_label_generator(template_path).generate_label(output, shipping_data)
+    return output.getvalue()
+
+
+label_executor = None
+
+
+def get_label_executor():
+    # Created on first use so every server process gets its own pool
+    global label_executor
+    if label_executor is None:
+        label_executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return label_executor
 
 
 @app.route('/v1/generate-labels', methods=['POST'])
@@ -121,34 +198,42 @@ def generate_labels():
     payload = request.json
     
     if not isinstance(payload, list):
-        return jsonify({"error": "Payload must be a list of shipping data objects"}), 400
+        return ojsonify({"error": "Payload must be a list of shipping data objects"}, 400)
     
-    output_folder = "generated_labels"
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+    template_path = TEMPLATE_PATH
 
-    template_path = "sample_template.pdf"
-    generator = USPSLabelGenerator(template_path)
-
-    generated_files = []
+    file_names = []
     for shipping_data in payload:
         tracking_number = shipping_data.get('tracking_number', 'unknown')
-        output_path = os.path.join(output_folder, f"{tracking_number}.pdf")
-        generator.generate_label(output_path, shipping_data)
-        generated_files.append(output_path)
-    
+        file_names.append(os.path.basename(f"{tracking_number}.pdf"))
 
+    # Rendering is CPU-bound, so spread batches over worker processes; a single
+    # label is cheaper to render in place than to ship to a worker
+    label_map = get_label_executor().map if len(payload) > 1 else map
+    generated_files = list(label_map(render_label, [template_path] * len(payload), payload))
 
     if len(generated_files) == 1:
-        return send_file(generated_files[0], as_attachment=True, download_name=f"{tracking_number}.pdf")
+        return send_file(
+            BytesIO(generated_files[0]),
+            mimetype="application/pdf",
+            as_attachment=True,
+            download_name=f"{tracking_number}.pdf",
+        )
     
-    zip_filename = "generated_labels.zip"
-    with zipfile.ZipFile(zip_filename, 'w') as zipf:
-        for file in generated_files:
-            zipf.write(file, os.path.basename(file))
+    zip_buffer = BytesIO()
+    # PDFs are already compressed, deflating them again only costs CPU
+    with zipfile.ZipFile(zip_buffer, 'w', compression=zipfile.ZIP_STORED) as zipf:
+        for file_name, pdf_bytes in zip(file_names, generated_files):
+            zipf.writestr(file_name, pdf_bytes)
+    zip_buffer.seek(0)
     
-    return send_file(zip_filename, as_attachment=True, download_name="generated_labels.zip")
+    return send_file(
+        zip_buffer,
+        mimetype="application/zip",
+        as_attachment=True,
+        download_name="generated_labels.zip",
+    )
     
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5001, debug=True)
+    app.run(host="0.0.0.0", port=5001, debug=bool(os.environ.get("FLASK_DEV")))
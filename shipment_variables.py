@@ -30580,4 +30580,13 @@ status_cache = [
         "_tips": "Item might undergo unusual shipping condition, this may due to several reasons, most likely item was returned to sender, customs issue, lost, damaged etc."
     }
 ]
-    
+
+# Lookup indexes over the caches above, keyed the way the 17track API refers to them.
+# On duplicate courier names the first entry wins, as it would in a linear scan.
+courier_code_by_slug = {}
+for courier in courier_cache:
+    courier_code_by_slug.setdefault(courier.get("_name").casefold(), courier.get("key"))
+
+courier_by_key = {str(courier.get("key")): courier for courier in courier_cache}
+country_by_number_key = {str(country.get("_numberKey")): country for country in country_cache}
+status_by_key = {int(status.get("key")): status for status in status_cache}
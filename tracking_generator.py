@@ -1,8 +1,11 @@
-import requests
+import asyncio
 import json
 import csv
+import itertools
 import os
-import time
+
+import aiohttp
+import orjson
 
 
 # CONSTANTS
@@ -13,42 +16,53 @@ CSV_FILE = "filtered_tracking_numbers.csv"
 BATCH_SIZE = 30
 DELAY_SECONDS = 10
 MAX_RETRIES = 5
+RETRY_STATUSES = {500, 502, 503, 504}
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_MAX_BACKOFF_SECONDS = 30
+CONCURRENT_BATCHES = 5
+CSV_BUFFER_SIZE = 1 << 20
 
 
+# The cache stays on json: orjson cannot round-trip the 22-digit last_tracking_number
 def load_cache():
     if os.path.exists(CACHE_FILE):
         with open(CACHE_FILE, "r") as file:
-            return json.load(file)
+            return json.load(file) or {}
     
-    return None
+    return {}
 
 def save_cache(cache):
     with open(CACHE_FILE, "w") as file:
         json.dump(cache, file, indent=4)
 
 
-def fetch_tracking_info(tracking_numbers):
-    payload = {
-        "tracking_information" : [{"tracking": str(num)} for num in tracking_numbers]
-    }
+def retry_backoff_seconds(attempt):
+    return min(RETRY_BACKOFF_FACTOR * (2 ** attempt), RETRY_MAX_BACKOFF_SECONDS)
 
+async def fetch_batch(session, payload):
     for attempt in range(MAX_RETRIES):
+        if attempt:
+            await asyncio.sleep(retry_backoff_seconds(attempt - 1))
         try:
-            response = requests.get(TRACKING_API_URL, json=payload)
+            async with session.get(TRACKING_API_URL, json=payload) as response:
+                if response.status == 200:
+                    return await response.json(loads=orjson.loads, content_type=None)
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                print(f"[!] - Attempt {attempt + 1}: Failed to fetch tracking info: {response.status_code}")
+            print(f"[!] - Attempt {attempt + 1}: Failed to fetch tracking info: {response.status}")
 
-                if response.status_code == 500:
-                    print(f"[!] - Server error (500). Retrying...")
-                    time.sleep(DELAY_SECONDS*54)
+            if response.status not in RETRY_STATUSES:
+                return None
+            print(f"[!] - Server error ({response.status}). Retrying...")
 
         except Exception as e:
             print(f"[!] - Attempt {attempt + 1}: Error fetching tracking info: {e}")
-            time.sleep(DELAY_SECONDS)
     return None
+
+async def fetch_tracking_info(session, tracking_numbers):
+    payload = {
+        "tracking_information" : [{"tracking": str(num)} for num in tracking_numbers]
+    }
+    return await fetch_batch(session, payload)
     
 def filter_tracking_numbers(tracking_info):
     filtered_data = []
@@ -77,47 +91,76 @@ def filter_tracking_numbers(tracking_info):
     return filtered_data
 
 def save_to_csv(filtered_data):
+    rows = [
+        (item["tracking_number"], item["status"], orjson.dumps(item["data"]).decode())
+        for item in filtered_data
+    ]
     file_exists = os.path.exists(CSV_FILE)
-    with open(CSV_FILE, mode="a", newline="") as file:
+    with open(CSV_FILE, mode="a", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as file:
         writer = csv.writer(file)
         if not file_exists:
             writer.writerow(["Tracking Number", "Status", "Data"])
-        for item in filtered_data:
-            writer.writerow([item["tracking_number"], item["status"], json.dumps(item["data"])])
+        writer.writerows(rows)
 
 
 
-def main():
-    global cache
-    cache = load_cache()
-    last_tracking_number = cache.get("last_tracking_number", START_TRACKING_NUMBER)
-    current_tracking_number = last_tracking_number
+def persist_batch(cache, last_tracking_number, tracking_info):
+    cache["last_tracking_number"] = last_tracking_number
+    save_cache(cache)
+    print(f"[+] - Last processed tracking number: {last_tracking_number}")
+
+    if not tracking_info:
+        return
+
+    filtered_data = filter_tracking_numbers(tracking_info)
+    if not filtered_data:
+        print("[!] - No matching tracking numbers in this batch.")
+        return
+
+    save_to_csv(filtered_data)
+    print(f"[+] - Saved {len(filtered_data)} tracking numbers to CSV.")
+
 
+async def persist_results(queue, cache):
+    # Batches arrive in order, so the checkpoint never skips ahead of a gap
     while True:
-        tracking_numbers = [current_tracking_number + i for i in range(BATCH_SIZE)]
-        current_tracking_number += BATCH_SIZE
+        item = await queue.get()
+        if item is None:
+            return
+        await asyncio.to_thread(persist_batch, cache, *item)
+
+
+async def main():
+    cache = load_cache()
+    tracking_numbers = itertools.count(cache.get("last_tracking_number", START_TRACKING_NUMBER))
+
+    queue = asyncio.Queue()
+    writer = asyncio.create_task(persist_results(queue, cache))
 
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=30, sock_connect=5)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        while True:
+            batches = [list(itertools.islice(tracking_numbers, BATCH_SIZE)) for _ in range(CONCURRENT_BATCHES)]
 
-        print(f"[+] Waiting for {DELAY_SECONDS} seconds before the batch...")
-        time.sleep(DELAY_SECONDS)
+            print(f"[+] Waiting for {DELAY_SECONDS} seconds before the next {len(batches)} batches...")
+            await asyncio.sleep(DELAY_SECONDS)
 
-        tracking_info = fetch_tracking_info(tracking_numbers)
+            results = await asyncio.gather(*(fetch_tracking_info(session, batch) for batch in batches))
 
-        cache["last_tracking_number"] = current_tracking_number
-        save_cache(cache)
-        print(f"[+] - Last processed tracking number: {current_tracking_number}")
+            failed = False
+            for batch, tracking_info in zip(batches, results):
+                await queue.put((batch[-1] + 1, tracking_info))
+                if not tracking_info:
+                    failed = True
+                    break
 
-        if not tracking_info:
-            break
+            if failed:
+                break
 
-        filtered_data = filter_tracking_numbers(tracking_info)
-        if not filtered_data:
-            print("[!] - No matching tracking numbers in this batch.")
-            continue
-        
-        save_to_csv(filtered_data)
-        print(f"[+] - Saved {len(filtered_data)} tracking numbers to CSV.")
+    await queue.put(None)
+    await writer
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())